@@ -5,36 +5,114 @@ Uses flight details from the priced offer (no actual API booking call)
 """
 
 import json
+import logging
 import os
 import sys
-import traceback
+import time
 from typing import Dict, Any, List
-import boto3
-from datetime import datetime
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+from datetime import datetime, timezone
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:  # Fall back to the standard library if orjson is unavailable
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), default=str)
+
+# Configure logging (set LOG_LEVEL=DEBUG to log incoming events)
+logger = logging.getLogger()
+# Unknown LOG_LEVEL values fall back to INFO instead of failing the import
+logger.setLevel(logging.getLevelNamesMapping().get(os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO))
 
 # S3 Configuration for passenger info
 S3_BUCKET = os.getenv("PERSONAL_INFO_BUCKET", "autorescue-personal-info")
 S3_KEY = os.getenv("PERSONAL_INFO_KEY", "personal_info.json")
 
-# Initialize S3 client
-s3_client = boto3.client('s3')
+# Optional SSM parameter holding the passenger info, read through the
+# Parameters and Secrets Lambda Extension when its layer is attached
+PASSENGER_INFO_PARAMETER = os.getenv("PASSENGER_INFO_PARAMETER")
+SECRETS_EXTENSION_PORT = os.getenv("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT")
+
+# S3 client, created on first use so boto3 is only imported when needed
+s3_client = None
+
+# Passenger info cache (reused across warm invocations; the S3 object rarely changes)
+PASSENGER_CACHE_TTL_SECONDS = 300
+_passenger_cache = {
+    "data": None,
+    "expires_at": 0.0
+}
+
+
+def _s3():
+    """
+    Create the S3 client on first use
+    """
+    global s3_client
+    if s3_client is None:
+        import boto3
+        s3_client = boto3.client('s3')
+    return s3_client
+
+
+def load_passenger_info_from_parameter() -> Dict[str, Any]:
+    """
+    Load passenger information from SSM Parameter Store via the extension's local cache
+    
+    Returns:
+        dict: Passenger information with public details
+    """
+    query = urlencode({"name": PASSENGER_INFO_PARAMETER, "withDecryption": "true"})
+    request = Request(
+        f"http://localhost:{SECRETS_EXTENSION_PORT}/systemsmanager/parameters/get?{query}",
+        headers={"X-Aws-Parameters-Secrets-Token": os.environ["AWS_SESSION_TOKEN"]}
+    )
+    with urlopen(request, timeout=2.0) as response:
+        return _json_loads(_json_loads(response.read())["Parameter"]["Value"])
 
 
 def load_passenger_info_from_s3() -> Dict[str, Any]:
     """
-    Load passenger information from S3
+    Load passenger information from S3 (or the SSM parameter, when configured)
     
     Returns:
         dict: Passenger information with public details
     """
+    # Return cached passenger info if recently fetched
+    if _passenger_cache["data"] and time.monotonic() < _passenger_cache["expires_at"]:
+        return _passenger_cache["data"]
+    
+    # Prefer the parameter from the extension's loopback cache, falling back to S3
+    if PASSENGER_INFO_PARAMETER and SECRETS_EXTENSION_PORT:
+        try:
+            passenger_data = load_passenger_info_from_parameter()
+            logger.info("Successfully loaded passenger info from parameter: %s", PASSENGER_INFO_PARAMETER)
+            
+            _passenger_cache["data"] = passenger_data
+            _passenger_cache["expires_at"] = time.monotonic() + PASSENGER_CACHE_TTL_SECONDS
+            return passenger_data
+        except Exception as e:
+            logger.warning("Passenger info parameter unavailable, using S3: %s", e)
+    
     try:
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=S3_KEY)
+        response = _s3().get_object(Bucket=S3_BUCKET, Key=S3_KEY)
         body = response['Body'].read()
-        passenger_data = json.loads(body)
-        print(f"Successfully loaded passenger info from S3: {S3_BUCKET}/{S3_KEY}")
+        passenger_data = _json_loads(body)
+        logger.info("Successfully loaded passenger info from S3: %s/%s", S3_BUCKET, S3_KEY)
+        
+        # Cache only real S3 data so a transient failure doesn't pin the defaults
+        _passenger_cache["data"] = passenger_data
+        _passenger_cache["expires_at"] = time.monotonic() + PASSENGER_CACHE_TTL_SECONDS
         return passenger_data
     except Exception as e:
-        print(f"Error loading passenger info from S3: {e}")
+        logger.error("Error loading passenger info from S3: %s", e)
         # Return default info if S3 fails
         return {
             "name": {
@@ -108,7 +186,7 @@ def book_flight(booking_data: Dict[str, Any]) -> Dict[str, Any]:
     passenger_email = passenger_info.get('contact', {}).get('email', 'passenger@example.com')
     
     # Generate a booking reference (timestamp-based for demo)
-    booking_reference = f"AR{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    booking_reference = f"AR{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
     
     # Extract flight details
     origin = first_segment.get('departure', {}).get('iataCode', 'N/A')
@@ -116,8 +194,7 @@ def book_flight(booking_data: Dict[str, Any]) -> Dict[str, Any]:
     departure_date = first_segment.get('departure', {}).get('at', 'N/A')
     carrier_code = first_segment.get('carrierCode', 'N/A')
     flight_number = f"{carrier_code}{first_segment.get('number', '')}"
-    total_price = price.get('total', 'N/A')
-    currency = price.get('currency', 'USD')
+    price_display = f"{price.get('currency', 'USD')} {price.get('total', 'N/A')}"
     
     return {
         "success": True,
@@ -134,7 +211,7 @@ def book_flight(booking_data: Dict[str, Any]) -> Dict[str, Any]:
                 "departureDate": departure_date,
                 "carrier": carrier_code,
                 "flightNumber": flight_number,
-                "price": f"{currency} {total_price}"
+                "price": price_display
             },
             "message": f"✈️ Your booking confirmation has been sent to {passenger_email}"
         },
@@ -150,7 +227,7 @@ def book_flight(booking_data: Dict[str, Any]) -> Dict[str, Any]:
                 "date": departure_date,
                 "airline": carrier_code,
                 "flight_number": flight_number,
-                "total_price": f"{currency} {total_price}"
+                "total_price": price_display
             },
             "status": "CONFIRMED"
         }
@@ -168,13 +245,13 @@ def lambda_handler(event, context):
         dict: HTTP response with booking results
     """
     try:
-        print(f"Received event: {json.dumps(event, indent=2)}")
+        logger.debug("Received event: %s", event)
         
         # Extract booking data from event
         if 'body' in event:
             # HTTP request from API Gateway
             if isinstance(event['body'], str):
-                booking_data = json.loads(event['body'])
+                booking_data = _json_loads(event['body'])
             else:
                 booking_data = event['body']
         else:
@@ -186,7 +263,7 @@ def lambda_handler(event, context):
             return {
                 "statusCode": 400,
                 "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({
+                "body": _json_dumps({
                     "success": False,
                     "error": "Invalid booking request. Required field: flight_offer"
                 })
@@ -200,17 +277,16 @@ def lambda_handler(event, context):
         return {
             "statusCode": status_code,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps(result, indent=2, default=str)
+            "body": _json_dumps(result)
         }
         
     except Exception as e:
-        print(f"Lambda error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.error("Lambda error: %s", e, exc_info=True)
         
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({
+            "body": _json_dumps({
                 "success": False,
                 "error": f"Internal server error: {str(e)}"
             })
@@ -3,27 +3,102 @@ Lambda function for Amadeus Flight Offer Pricing API
 Validates and gets the final price for a selected flight offer
 """
 
+import atexit
 import json
 import logging
 import os
-from datetime import datetime, timedelta
+import time
+from urllib.parse import urlencode
 
-import boto3
-import requests
+import urllib3
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:  # Fall back to the standard library if orjson is unavailable
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), default=str)
 
 # Configure logging
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# Unknown LOG_LEVEL values fall back to INFO instead of failing the import
+logger.setLevel(logging.getLevelNamesMapping().get(os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO))
 
 # Amadeus API Configuration
 AMADEUS_BASE_URL = os.environ.get("AMADEUS_BASE_URL", "https://test.api.amadeus.com")
-
-# AWS Clients
-secretsmanager = boto3.client('secretsmanager')
+AMADEUS_SECRET_NAME = "autorescue/amadeus/credentials"
+
+# Parameters and Secrets Lambda Extension port (set when the extension layer is attached)
+SECRETS_EXTENSION_PORT = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT")
+
+# AWS Clients (created on first use so boto3 is only imported when needed)
+secretsmanager = None
+
+# HTTP connection pool reused across warm invocations so the Amadeus TLS connection stays open.
+# Pricing is a POST but has no side effects, so it is retried like a GET. Timeouts and retries
+# fit the 30 s function timeout: extension 2 s + token 5 s (not retried) + two 10 s pricing attempts.
+http_pool = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=20,
+    retries=urllib3.Retry(
+        total=1,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=urllib3.Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        respect_retry_after_header=False,  # a long Retry-After would overrun the budget
+        raise_on_status=False,  # hand the last response back so raise_for_status reports it
+    ),
+)
+atexit.register(http_pool.clear)
 
 # Cache for credentials and tokens (in-memory, reused across warm Lambda invocations)
 _secrets_cache = {}
-_token_cache = {"access_token": None, "expires_at": None}
+_token_cache = {"access_token": None, "request_headers": None, "expires_at": 0.0}
+
+
+def raise_for_status(response, url):
+    """
+    Log and raise an HTTPError for 4xx/5xx responses
+    """
+    if response.status >= 400:
+        logger.error(f"Response Status Code: {response.status}")
+        logger.error(f"Response Headers: {dict(response.headers)}")
+        logger.error(f"Response Body: {response.data.decode(errors='replace')}")
+        kind = "Client" if response.status < 500 else "Server"
+        raise urllib3.exceptions.HTTPError(f"{response.status} {kind} Error for url: {url}")
+
+
+def get_secret_from_extension():
+    """
+    Read the Amadeus secret from the Parameters and Secrets Lambda Extension's local cache
+    """
+    url = f"http://localhost:{SECRETS_EXTENSION_PORT}/secretsmanager/get"
+    response = http_pool.request(
+        "GET",
+        url,
+        fields={"secretId": AMADEUS_SECRET_NAME},
+        headers={"X-Aws-Parameters-Secrets-Token": os.environ["AWS_SESSION_TOKEN"]},
+        timeout=2.0,
+        retries=False,
+    )
+    raise_for_status(response, url)
+    return _json_loads(response.data)["SecretString"]
+
+
+def get_secretsmanager_client():
+    """
+    Create the Secrets Manager client on first use
+    """
+    global secretsmanager
+    if secretsmanager is None:
+        import boto3
+        secretsmanager = boto3.client('secretsmanager')
+    return secretsmanager
 
 
 def get_amadeus_credentials():
@@ -31,23 +106,36 @@ def get_amadeus_credentials():
     Retrieve Amadeus credentials from AWS Secrets Manager with caching
     """
     cache_key = 'amadeus_credentials'
-    current_time = datetime.now()
+    current_time = time.monotonic()
     
     # Check cache (1 hour TTL)
     if cache_key in _secrets_cache:
         cached_data, cached_time = _secrets_cache[cache_key]
-        if (current_time - cached_time).seconds < 3600:
+        if current_time - cached_time < 3600:
             return cached_data
     
-    # Fetch from Secrets Manager
+    # Prefer the extension's loopback cache, falling back to the Secrets Manager API
+    secret_string = None
+    if SECRETS_EXTENSION_PORT:
+        try:
+            secret_string = get_secret_from_extension()
+        except Exception as e:
+            logger.warning(f"Secrets extension unavailable, using Secrets Manager: {str(e)}")
+
     try:
-        response = secretsmanager.get_secret_value(
-            SecretId='autorescue/amadeus/credentials'
-        )
-        credentials = json.loads(response['SecretString'])
+        if secret_string is None:
+            response = get_secretsmanager_client().get_secret_value(SecretId=AMADEUS_SECRET_NAME)
+            secret_string = response['SecretString']
+        credentials = _json_loads(secret_string)
         
-        # Cache the credentials
+        # Cache the credentials along with the urlencoded token request body
         _secrets_cache[cache_key] = (credentials, current_time)
+        token_body = urlencode({
+            "grant_type": "client_credentials",
+            "client_id": credentials['client_id'],
+            "client_secret": credentials['client_secret'],
+        }).encode()
+        _secrets_cache['amadeus_token_body'] = (token_body, current_time)
         
         return credentials
     except Exception as e:
@@ -60,39 +148,44 @@ def get_amadeus_token():
     Get Amadeus OAuth2 token with caching
     Token is cached and reused until it expires
     """
-    global _token_cache
-
     # Check if we have a valid cached token
-    if _token_cache["access_token"] and _token_cache["expires_at"]:
-        if datetime.now() < _token_cache["expires_at"]:
+    if _token_cache["access_token"]:
+        if time.monotonic() < _token_cache["expires_at"]:
             logger.info("Using cached Amadeus access token")
             return _token_cache["access_token"]
 
     # Get new token
     logger.info("Fetching new Amadeus access token")
-    credentials = get_amadeus_credentials()
+    get_amadeus_credentials()
+    token_body, _ = _secrets_cache['amadeus_token_body']
     
     url = f"{AMADEUS_BASE_URL}/v1/security/oauth2/token"
 
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": credentials['client_id'],
-        "client_secret": credentials['client_secret'],
-    }
-
     try:
-        response = requests.post(url, headers=headers, data=data, timeout=10)
-        response.raise_for_status()
+        response = http_pool.request(
+            "POST",
+            url,
+            headers=headers,
+            body=token_body,
+            timeout=urllib3.Timeout(connect=2.0, read=3.0),
+            retries=False,
+        )
+        raise_for_status(response, url)
 
-        token_data = response.json()
+        token_data = _json_loads(response.data)
         access_token = token_data["access_token"]
         expires_in = token_data.get("expires_in", 1799)  # Default ~30 minutes
 
         # Cache the token with expiration (subtract 60 seconds for safety margin)
         _token_cache["access_token"] = access_token
-        _token_cache["expires_at"] = datetime.now() + timedelta(seconds=expires_in - 60)
+        _token_cache["request_headers"] = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "X-HTTP-Method-Override": "GET",
+        }
+        _token_cache["expires_at"] = time.monotonic() + expires_in - 60
 
         logger.info(
             f"Successfully obtained Amadeus token, expires in {expires_in} seconds"
@@ -117,17 +210,13 @@ def price_flight_offer(flight_offer_data):
         dict: Pricing details with final price, taxes, fees, and booking information
     """
     try:
-        # Get access token
+        # Get access token (the request headers are built once per token)
         access_token = get_amadeus_token()
 
         # Amadeus Flight Offers Pricing API endpoint
         url = f"{AMADEUS_BASE_URL}/v1/shopping/flight-offers/pricing"
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-            "X-HTTP-Method-Override": "GET",
-        }
+        headers = _token_cache["request_headers"]
 
         # Validate mandatory fields
         if not flight_offer_data.get("travelerPricings"):
@@ -159,30 +248,34 @@ def price_flight_offer(flight_offer_data):
         logger.info(f"URL: {url}")
         logger.info(f"Headers: {json.dumps({k: v for k, v in headers.items() if k != 'Authorization'})}")
         logger.info(f"Authorization: Bearer {access_token[:20]}...")  # Only log first 20 chars of token
-        logger.info(f"Payload: {json.dumps(payload, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Payload: {_json_dumps(payload)}")
 
         # Make the API request
-        response = requests.post(url, headers=headers, json=payload, timeout=15)
+        response = http_pool.request(
+            "POST",
+            url,
+            headers=headers,
+            body=_json_dumps(payload),
+            timeout=urllib3.Timeout(connect=3.0, read=7.0),
+        )
         
         # Log response details
         logger.info(f"[AMADEUS API RESPONSE]")
-        logger.info(f"Status Code: {response.status_code}")
+        logger.info(f"Status Code: {response.status}")
         logger.info(f"Response Headers: {dict(response.headers)}")
         
-        response.raise_for_status()
+        raise_for_status(response, url)
 
-        pricing_data = response.json()
-        logger.info(f"Response Body: {json.dumps(pricing_data, indent=2)}")
+        pricing_data = _json_loads(response.data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Response Body: {_json_dumps(pricing_data)}")
 
         logger.info("Successfully priced flight offer")
         return pricing_data
 
-    except requests.exceptions.RequestException as e:
+    except urllib3.exceptions.HTTPError as e:
         logger.error(f"Error calling Amadeus Pricing API: {str(e)}")
-        if hasattr(e, 'response') and e.response is not None:
-            logger.error(f"Response Status Code: {e.response.status_code}")
-            logger.error(f"Response Headers: {dict(e.response.headers)}")
-            logger.error(f"Response Body: {e.response.text}")
         raise
     except Exception as e:
         logger.error(f"Unexpected error in price_flight_offer: {str(e)}")
@@ -223,6 +316,12 @@ def format_pricing_response(pricing_data):
         # Extract traveler pricing
         traveler_pricings = priced_offer.get("travelerPricings", [])
 
+        # Map segment IDs to cabins in one pass over the first traveler's fare details
+        cabin_by_segment = {}
+        if traveler_pricings:
+            for fare in traveler_pricings[0].get("fareDetailsBySegment", []):
+                cabin_by_segment.setdefault(fare.get("segmentId"), fare.get("cabin"))
+
         # Format the response
         formatted_response = {
             "offer_id": priced_offer.get("id"),
@@ -257,20 +356,7 @@ def format_pricing_response(pricing_data):
                             "carrier_code": seg.get("carrierCode"),
                             "flight_number": seg.get("number"),
                             "aircraft": seg.get("aircraft", {}).get("code"),
-                            "cabin": (
-                                next(
-                                    (
-                                        fare.get("cabin")
-                                        for fare in traveler_pricings[0].get(
-                                            "fareDetailsBySegment", []
-                                        )
-                                        if fare.get("segmentId") == seg.get("id")
-                                    ),
-                                    "ECONOMY",
-                                )
-                                if traveler_pricings
-                                else "ECONOMY"
-                            ),
+                            "cabin": cabin_by_segment.get(seg.get("id"), "ECONOMY"),
                         }
                         for seg in itinerary.get("segments", [])
                     ],
@@ -316,16 +402,18 @@ def lambda_handler(event, context):
         "body": { ... pricing details ... }
     }
     """
-    logger.info(f"[LAMBDA INPUT] Received event: {json.dumps(event, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"[LAMBDA INPUT] Received event: {_json_dumps(event)}")
 
     try:
         # Parse input
         if isinstance(event.get("body"), str):
-            body = json.loads(event["body"])
+            body = _json_loads(event["body"])
         else:
             body = event.get("body", event)
 
-        logger.info(f"[LAMBDA INPUT] Parsed body: {json.dumps(body, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[LAMBDA INPUT] Parsed body: {_json_dumps(body)}")
 
         # Check if it's a flight offer wrapped in "flight_offer" key or direct flight offer
         if "flight_offer" in body:
@@ -341,7 +429,8 @@ def lambda_handler(event, context):
             flight_offer = None
             logger.error("[LAMBDA INPUT] No valid flight offer format found")
 
-        logger.info(f"[LAMBDA INPUT] Final flight_offer: {json.dumps(flight_offer, indent=2) if flight_offer else 'None'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[LAMBDA INPUT] Final flight_offer: {_json_dumps(flight_offer) if flight_offer else 'None'}")
 
         if not flight_offer:
             return {
@@ -372,7 +461,7 @@ def lambda_handler(event, context):
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps(formatted_response, default=str),
+            "body": _json_dumps(formatted_response),
         }
 
     except Exception as e:
@@ -5,51 +5,155 @@ Invoked by AgentCore Gateway
 """
 import os
 import json
-import boto3
-import requests
-from datetime import datetime, timedelta
+import atexit
+import logging
+import threading
+import time
+import urllib3
+from collections import OrderedDict
 from typing import Dict, Any
+from urllib.parse import urlencode
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:  # Fall back to the standard library if orjson is unavailable
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+
+# Configure logging (set LOG_LEVEL=DEBUG to log incoming events)
+logger = logging.getLogger()
+# Unknown LOG_LEVEL values fall back to INFO instead of failing the import
+logger.setLevel(logging.getLevelNamesMapping().get(os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO))
 
 # Amadeus API Configuration
 AMADEUS_BASE_URL = "https://test.api.amadeus.com"
+AMADEUS_SECRET_NAME = "autorescue/amadeus/credentials"
+
+# Parameters and Secrets Lambda Extension port (set when the extension layer is attached)
+SECRETS_EXTENSION_PORT = os.getenv('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT')
+
+# Secrets Manager client (Lambda container reuse); boto3 is only imported
+# on the fallback path so warm and extension-backed starts skip it
+_secrets_client = None
+
+# HTTP connection pool (Lambda container reuse) - keeps the TLS connection to Amadeus warm.
+# Timeouts and retries are sized to finish inside the 30 s function timeout even in the
+# worst case: extension 2 s + token request 5 s (not retried) + two 10 s search attempts.
+_http = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=20,
+    retries=urllib3.Retry(
+        total=1,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=False,  # a long Retry-After would overrun the budget
+        raise_on_status=False  # hand the last response back so _raise_for_status reports it
+    ),
+    timeout=urllib3.Timeout(connect=3.0, read=7.0)
+)
+_TOKEN_REQUEST_TIMEOUT = urllib3.Timeout(connect=2.0, read=3.0)
+atexit.register(_http.clear)
 
 # Secrets cache (Lambda container reuse)
 _secrets_cache = {
     'amadeus_credentials': None,
-    'fetched_at': None
+    'token_body': None,
+    'expires_at': 0.0
 }
 
+_TOKEN_REQUEST_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
 # Token cache (Lambda container reuse)
+# Amadeus tokens expire in 1799 seconds, cache for 25 minutes to be safe
+TOKEN_TTL_SECONDS = 1500
 _token_cache = {
     'access_token': None,
-    'expiry': None
+    'request_headers': None,
+    'expiry': 0.0
 }
 
+# Search results cache (Lambda container reuse)
+# Amadeus offer prices only change a few times a day, so identical searches
+# within a few minutes are served from memory. Only successful results are cached.
+SEARCH_CACHE_TTL_SECONDS = 300
+SEARCH_CACHE_MAX_ENTRIES = 1024
+_search_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+
+def _raise_for_status(response: urllib3.BaseHTTPResponse, url: str) -> None:
+    """
+    Raise an HTTPError for 4xx/5xx responses
+    """
+    if response.status >= 400:
+        kind = "Client" if response.status < 500 else "Server"
+        raise urllib3.exceptions.HTTPError(f"{response.status} {kind} Error for url: {url}")
+
+
+def _get_secret_from_extension() -> str:
+    """
+    Read the Amadeus secret from the Parameters and Secrets Lambda Extension's local cache
+    """
+    url = f"http://localhost:{SECRETS_EXTENSION_PORT}/secretsmanager/get"
+    response = _http.request(
+        "GET",
+        url,
+        fields={"secretId": AMADEUS_SECRET_NAME},
+        headers={"X-Aws-Parameters-Secrets-Token": os.environ['AWS_SESSION_TOKEN']},
+        timeout=2.0,
+        retries=False
+    )
+    _raise_for_status(response, url)
+    return _json_loads(response.data)['SecretString']
+
+
+def _get_secrets_client():
+    """
+    Create the Secrets Manager client on first use
+    """
+    global _secrets_client
+    if _secrets_client is None:
+        import boto3
+        _secrets_client = boto3.client('secretsmanager', region_name=os.getenv('AWS_REGION', 'us-east-1'))
+    return _secrets_client
+
 
 def _get_amadeus_credentials() -> Dict[str, str]:
     """
     Fetch Amadeus credentials from AWS Secrets Manager with caching
     """
     # Return cached credentials if recently fetched (within 1 hour)
-    if _secrets_cache['amadeus_credentials'] and _secrets_cache['fetched_at']:
-        elapsed = datetime.now() - _secrets_cache['fetched_at']
-        if elapsed.total_seconds() < 3600:
-            return _secrets_cache['amadeus_credentials']
-    
-    # Fetch from Secrets Manager
-    secret_name = "autorescue/amadeus/credentials"
-    region_name = os.getenv('AWS_REGION', 'us-east-1')
+    if _secrets_cache['amadeus_credentials'] and time.monotonic() < _secrets_cache['expires_at']:
+        return _secrets_cache['amadeus_credentials']
     
-    client = boto3.client('secretsmanager', region_name=region_name)
+    # Prefer the extension's loopback cache, falling back to the Secrets Manager API
+    secret_string = None
+    if SECRETS_EXTENSION_PORT:
+        try:
+            secret_string = _get_secret_from_extension()
+        except Exception as e:
+            logger.warning("[SEARCH_FLIGHTS] Secrets extension unavailable, using Secrets Manager: %s", e)
     
     try:
-        response = client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(response['SecretString'])
+        if secret_string is None:
+            secret_string = _get_secrets_client().get_secret_value(SecretId=AMADEUS_SECRET_NAME)['SecretString']
+        secret = _json_loads(secret_string)
         
-        # Cache the credentials
+        # Cache the credentials along with the urlencoded token request body
         _secrets_cache['amadeus_credentials'] = secret
-        _secrets_cache['fetched_at'] = datetime.now()
+        _secrets_cache['token_body'] = urlencode({
+            "grant_type": "client_credentials",
+            "client_id": secret['client_id'],
+            "client_secret": secret['client_secret']
+        }).encode()
+        _secrets_cache['expires_at'] = time.monotonic() + 3600
         
         return secret
     except Exception as e:
@@ -60,33 +164,61 @@ def _get_amadeus_token() -> str:
     """
     Get Amadeus OAuth2 token with caching
     """
-    now = datetime.now()
-    
     # Return cached token if still valid
-    if _token_cache['access_token'] and _token_cache['expiry'] and now < _token_cache['expiry']:
+    if _token_cache['access_token'] and time.monotonic() < _token_cache['expiry']:
         return _token_cache['access_token']
     
-    # Get credentials from Secrets Manager
-    credentials = _get_amadeus_credentials()
+    # Get credentials from Secrets Manager (also refreshes the prebuilt token body)
+    _get_amadeus_credentials()
     
     # Request new token
     url = f"{AMADEUS_BASE_URL}/v1/security/oauth2/token"
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": credentials['client_id'],
-        "client_secret": credentials['client_secret']
-    }
-    
-    response = requests.post(url, headers=headers, data=data)
-    response.raise_for_status()
+    response = _http.request(
+        "POST",
+        url,
+        headers=_TOKEN_REQUEST_HEADERS,
+        body=_secrets_cache['token_body'],
+        timeout=_TOKEN_REQUEST_TIMEOUT,
+        retries=False
+    )
+    _raise_for_status(response, url)
     
-    token_data = response.json()
-    _token_cache['access_token'] = token_data['access_token']
-    # Amadeus tokens expire in 1799 seconds, cache for 25 minutes to be safe
-    _token_cache['expiry'] = now + timedelta(seconds=1500)
+    access_token = _json_loads(response.data)['access_token']
+    _token_cache['access_token'] = access_token
+    _token_cache['request_headers'] = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json"
+    }
+    _token_cache['expiry'] = time.monotonic() + TOKEN_TTL_SECONDS
     
-    return _token_cache['access_token']
+    return access_token
+
+
+def _get_cached_search(key: tuple):
+    """
+    Return a cached search result for the key, or None if missing or expired
+    """
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del _search_cache[key]
+            return None
+        _search_cache.move_to_end(key)
+        return result
+
+
+def _store_cached_search(key: tuple, result: Dict[str, Any]) -> None:
+    """
+    Cache a search result, evicting the least recently used entries when full
+    """
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL_SECONDS, result)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+            _search_cache.popitem(last=False)
 
 
 def search_flights(
@@ -111,16 +243,25 @@ def search_flights(
     Returns:
         Dictionary containing flight offers and metadata
     """
+    cache_key = (
+        origin.upper(),
+        destination.upper(),
+        departure_date,
+        adults,
+        max_results,
+        (carrier or "").upper()
+    )
+    cached = _get_cached_search(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Get access token
-        access_token = _get_amadeus_token()
+        # Get access token (the request headers are built once per token)
+        _get_amadeus_token()
         
         # Prepare API request
         url = f"{AMADEUS_BASE_URL}/v2/shopping/flight-offers"
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+        headers = _token_cache['request_headers']
         params = {
             "originLocationCode": origin.upper(),
             "destinationLocationCode": destination.upper(),
@@ -135,10 +276,10 @@ def search_flights(
             params["includedAirlineCodes"] = carrier.upper()
         
         # Make API call
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
+        response = _http.request("GET", url, headers=headers, fields=params)
+        _raise_for_status(response, url)
         
-        data = response.json()
+        data = _json_loads(response.data)
         
         # Format response
         if 'data' not in data or len(data['data']) == 0:
@@ -192,7 +333,7 @@ def search_flights(
             
             flights_with_summaries.append(flight_with_summary)
         
-        return {
+        result = {
             "success": True,
             "message": f"Found {len(flights_with_summaries)} flights from {origin} to {destination}",
             "flight_count": len(flights_with_summaries),
@@ -201,8 +342,10 @@ def search_flights(
             "departure_date": departure_date,
             "flights": flights_with_summaries  # Each flight has summary + complete Amadeus offer
         }
+        _store_cached_search(cache_key, result)
+        return result
         
-    except requests.exceptions.HTTPError as e:
+    except urllib3.exceptions.HTTPError as e:
         return {
             "success": False,
             "error": f"Amadeus API error: {str(e)}",
@@ -222,22 +365,23 @@ def lambda_handler(event, context):
     """
     Lambda handler for flight search requests
     """
-    # Enhanced logging
-    print(f"[SEARCH_FLIGHTS] ===== NEW REQUEST =====")
-    print(f"[SEARCH_FLIGHTS] Received event: {json.dumps(event)}")
+    logger.info("[SEARCH_FLIGHTS] ===== NEW REQUEST =====")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[SEARCH_FLIGHTS] Received event: %s", _json_dumps(event))
     
     try:
         # Parse input parameters
         # Handle different event formats: API Gateway (with body) vs Direct invocation
         if 'body' in event and isinstance(event['body'], str):
-            body = json.loads(event['body'])
+            body = _json_loads(event['body'])
         elif 'body' in event and isinstance(event['body'], dict):
             body = event['body']
         else:
             # Direct invocation - parameters are in event root
             body = event
         
-        print(f"[SEARCH_FLIGHTS] Parsed body: {json.dumps(body)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[SEARCH_FLIGHTS] Parsed body: %s", _json_dumps(body))
         
         # Extract parameters
         origin = body.get('origin')
@@ -247,12 +391,15 @@ def lambda_handler(event, context):
         max_results = body.get('max_results', 5)
         carrier = body.get('carrier')
         
-        print(f"[SEARCH_FLIGHTS] Parameters - Origin: {origin}, Destination: {destination}, Date: {departure_date}, Adults: {adults}")
+        logger.info(
+            "[SEARCH_FLIGHTS] Parameters - Origin: %s, Destination: %s, Date: %s, Adults: %s",
+            origin, destination, departure_date, adults
+        )
         
         # Validate required parameters
         if not all([origin, destination, departure_date]):
             error_msg = f"Missing required parameters - origin: {origin}, destination: {destination}, date: {departure_date}"
-            print(f"[SEARCH_FLIGHTS] ERROR: {error_msg}")
+            logger.error("[SEARCH_FLIGHTS] ERROR: %s", error_msg)
             return {
                 'statusCode': 400,
                 'headers': {'Content-Type': 'application/json'},
@@ -262,7 +409,6 @@ def lambda_handler(event, context):
                 })
             }
         
-        print(f"[SEARCH_FLIGHTS] Calling search_flights()...")
         # Search for flights
         result = search_flights(
             origin=origin,
@@ -273,22 +419,22 @@ def lambda_handler(event, context):
             carrier=carrier
         )
         
-        print(f"[SEARCH_FLIGHTS] Search completed. Success: {result.get('success')}, Flight count: {result.get('flight_count', 0)}")
+        logger.info(
+            "[SEARCH_FLIGHTS] Search completed. Success: %s, Flight count: %s",
+            result.get('success'), result.get('flight_count', 0)
+        )
         
         # Return success response
         response = {
             'statusCode': 200,
             'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(result)
+            'body': _json_dumps(result)
         }
-        print(f"[SEARCH_FLIGHTS] Returning success response")
         return response
         
     except Exception as e:
         error_msg = f"Lambda error: {str(e)}"
-        print(f"[SEARCH_FLIGHTS] ERROR: {error_msg}")
-        import traceback
-        print(f"[SEARCH_FLIGHTS] Traceback: {traceback.format_exc()}")
+        logger.error("[SEARCH_FLIGHTS] ERROR: %s", error_msg, exc_info=True)
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
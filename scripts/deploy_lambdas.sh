@@ -6,6 +6,8 @@ set -e
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 LAMBDA_DIR="$PROJECT_ROOT/lambda_functions"
+# Python version of the Lambda runtime (keep in sync with Runtime in template-sam.yaml)
+LAMBDA_PYTHON_VERSION="3.13"
 
 echo "🚀 Deploying Lambda Functions..."
 echo "Project Root: $PROJECT_ROOT"
@@ -27,8 +29,11 @@ deploy_lambda() {
     # Install dependencies if requirements.txt exists
     if [ -f "$lambda_path/requirements.txt" ]; then
         echo "📥 Installing dependencies..."
-        uv pip install -r "$lambda_path/requirements.txt" --target "$temp_dir/" --quiet --no-cache || \
-        pip3 install -r "$lambda_path/requirements.txt" -t "$temp_dir/" --quiet --no-cache-dir
+        # Functions run on arm64, so fetch aarch64 wheels regardless of the build host
+        uv pip install -r "$lambda_path/requirements.txt" --target "$temp_dir/" --quiet --no-cache \
+            --python-platform aarch64-manylinux2014 --python-version "$LAMBDA_PYTHON_VERSION" || \
+        pip3 install -r "$lambda_path/requirements.txt" -t "$temp_dir/" --quiet --no-cache-dir \
+            --platform manylinux2014_aarch64 --python-version "$LAMBDA_PYTHON_VERSION" --only-binary=:all:
     fi
     
     # Create deployment package
@@ -19,6 +19,8 @@ echo ""
 
 STACK_NAME="autorescue-lambdas"
 TEMPLATE_FILE="template-sam.yaml"
+# Python version of the Lambda runtime (keep in sync with Runtime in template-sam.yaml)
+LAMBDA_PYTHON_VERSION="3.13"
 REGION="${AWS_REGION:-us-east-1}"
 S3_BUCKET="${SAM_BUCKET:-autorescue-lambda-deployment-${RANDOM}}"
 
@@ -81,11 +83,13 @@ else
     cd lambda_functions/search_flights
     if [ -d package ]; then rm -rf package; fi
     mkdir package
-    # Use UV or pip depending on availability
+    # Use UV or pip depending on availability (functions run on arm64)
     if command -v uv &> /dev/null; then
-        uv pip install -q -r requirements.txt --target package/ --no-cache
+        uv pip install -q -r requirements.txt --target package/ --no-cache \
+            --python-platform aarch64-manylinux2014 --python-version "$LAMBDA_PYTHON_VERSION"
     else
-        pip install -q -r requirements.txt -t package/ --no-cache-dir
+        pip install -q -r requirements.txt -t package/ --no-cache-dir \
+            --platform manylinux2014_aarch64 --python-version "$LAMBDA_PYTHON_VERSION" --only-binary=:all:
     fi
     cp lambda_function.py package/
     cd package
@@ -100,11 +104,13 @@ else
     cd lambda_functions/offer_price
     if [ -d package ]; then rm -rf package; fi
     mkdir package
-    # Use UV or pip depending on availability
+    # Use UV or pip depending on availability (functions run on arm64)
     if command -v uv &> /dev/null; then
-        uv pip install -q -r requirements.txt --target package/ --no-cache
+        uv pip install -q -r requirements.txt --target package/ --no-cache \
+            --python-platform aarch64-manylinux2014 --python-version "$LAMBDA_PYTHON_VERSION"
     else
-        pip install -q -r requirements.txt -t package/ --no-cache-dir
+        pip install -q -r requirements.txt -t package/ --no-cache-dir \
+            --platform manylinux2014_aarch64 --python-version "$LAMBDA_PYTHON_VERSION" --only-binary=:all:
     fi
     cp lambda_function.py package/
     cd package
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Local test script for the AutoRescue Agent Runtime request paths that don't need AWS
+Covers the current-time fast path, streamed text coalescing and batch fan-out
+(needs the agent_runtime requirements installed; no model or gateway calls are made)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add agent_runtime to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent_runtime'))
+
+import autorescue_agent
+from autorescue_agent import _TIME_QUERY_RE, _stream_text
+
+
+TIME_QUERIES = [
+    "what time is it?",
+    "What time is it now",
+    "what's the time",
+    "  What is the current time now?  ",
+    "current time",
+    "current_time",
+]
+
+OTHER_QUERIES = [
+    "what time is my flight?",
+    "What is the time in Tokyo?",
+    "book a flight at the current time",
+    "time",
+    "search flights from JFK to LAX",
+]
+
+
+def test_time_query_regex():
+    """Only bare current-time questions take the fast path"""
+    for query in TIME_QUERIES:
+        assert _TIME_QUERY_RE.match(query), query
+    for query in OTHER_QUERIES:
+        assert not _TIME_QUERY_RE.match(query), query
+
+
+def test_entrypoint_time_fast_path():
+    """A time question is answered without building an agent; a non-string prompt is rejected"""
+    result = asyncio.run(autorescue_agent.invoke({"prompt": "what time is it?"}))
+    assert result["model"] == "fast-path"
+    assert "error" not in result
+
+    for prompt in (["what time is it?"], {"text": "hi"}, 42):
+        result = asyncio.run(autorescue_agent.invoke({"prompt": prompt}))
+        assert result == autorescue_agent._INVALID_PROMPT_ERROR, result
+
+
+class FakeStreamingAgent:
+    """Yields (delay, event) pairs the way AutoRescueAgent.stream does"""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def stream(self, user_query):
+        for delay, event in self.events:
+            if delay:
+                await asyncio.sleep(delay)
+            yield event
+
+
+def collect_stream(events):
+    async def collect():
+        return [chunk async for chunk in _stream_text(FakeStreamingAgent(events), "hi")]
+    return asyncio.run(collect())
+
+
+def test_stream_coalesces_small_chunks():
+    """Tokens arriving together are sent as one chunk; non-text events are dropped"""
+    chunks = collect_stream([
+        (0, {"data": "Hel"}),
+        (0, {"init_event_loop": True}),
+        (0, {"data": "lo "}),
+        (0, {"data": "world"}),
+    ])
+    assert chunks == ["Hello world"]
+
+
+def test_stream_flushes_on_size_and_interval():
+    """A full buffer is flushed immediately and text is never held past the flush interval"""
+    big = "a" * autorescue_agent.STREAM_FLUSH_CHARS
+    assert collect_stream([(0, {"data": big}), (0, {"data": "b"})]) == [big, "b"]
+
+    gap = autorescue_agent.STREAM_FLUSH_INTERVAL * 4
+    assert collect_stream([(0, {"data": "one"}), (gap, {"data": "two"})]) == ["one", "two"]
+
+
+def test_stream_flushes_text_before_error():
+    """Buffered text is sent before an error event, which is passed through as-is"""
+    chunks = collect_stream([(0, {"data": "partial"}), (0, {"error": "boom"})])
+    assert chunks == ["partial", {"error": "boom"}]
+
+
+class FakeResult:
+    def __init__(self, text):
+        self.message = {"content": [{"text": text}]}
+
+
+class FakeStrandsAgent:
+    """Answers with the upper-cased query and tracks how many calls overlap"""
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    async def invoke_async(self, user_query):
+        self.owner.active += 1
+        self.owner.peak = max(self.owner.peak, self.owner.active)
+        try:
+            await asyncio.sleep(0.01)
+            if user_query == "fail":
+                raise RuntimeError("model error")
+            return FakeResult(user_query.upper())
+        finally:
+            self.owner.active -= 1
+
+
+class FakeAutoRescueAgent(autorescue_agent.AutoRescueAgent):
+    """AutoRescueAgent without the model and gateway; each query gets a fake Strands agent"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    def _new_agent(self, messages=None):
+        return FakeStrandsAgent(self)
+
+
+def test_batch_keeps_order_and_caps_concurrency():
+    """Batch answers come back in prompt order, errors stay per prompt, concurrency is capped"""
+    original_concurrency = autorescue_agent.BATCH_CONCURRENCY
+    autorescue_agent.BATCH_CONCURRENCY = 2
+    try:
+        agent = FakeAutoRescueAgent()
+        started = time.monotonic()
+        responses = asyncio.run(agent.ainvoke_batch(["a", "b", "fail", "c"]))
+        elapsed = time.monotonic() - started
+    finally:
+        autorescue_agent.BATCH_CONCURRENCY = original_concurrency
+
+    assert responses[0] == "A" and responses[1] == "B" and responses[3] == "C"
+    assert responses[2].startswith("Error invoking agent")
+    assert agent.peak == 2
+    assert elapsed < 0.04 * 4
+
+
+def main():
+    """Run the local agent runtime tests"""
+    tests = [
+        test_time_query_regex,
+        test_entrypoint_time_fast_path,
+        test_stream_coalesces_small_chunks,
+        test_stream_flushes_on_size_and_interval,
+        test_stream_flushes_text_before_error,
+        test_batch_keeps_order_and_caps_concurrency,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
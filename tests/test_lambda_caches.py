@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Local test script for the warm-container caches in the Lambda functions
+Covers the book_flight passenger info cache and the search_flights result cache
+(search_flights needs urllib3 installed; no AWS or Amadeus calls are made)
+"""
+
+import importlib.util
+import io
+import json
+import os
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(__file__), '..', 'lambda_functions')
+
+
+def load_lambda(name):
+    """Import a Lambda's lambda_function.py under a unique module name"""
+    spec = importlib.util.spec_from_file_location(
+        f"{name}_lambda_function",
+        os.path.join(LAMBDA_DIR, name, 'lambda_function.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeS3Client:
+    """Stands in for the S3 client and counts GetObject calls"""
+
+    def __init__(self, passenger=None):
+        self.passenger = passenger
+        self.calls = 0
+
+    def get_object(self, Bucket, Key):
+        self.calls += 1
+        if self.passenger is None:
+            raise RuntimeError("S3 unavailable")
+        return {"Body": io.BytesIO(json.dumps(self.passenger).encode())}
+
+
+PASSENGER = {
+    "name": {"firstName": "Ada", "lastName": "Lovelace"},
+    "contact": {"email": "ada@example.com"}
+}
+
+
+def reset_passenger_cache(book_flight, s3):
+    book_flight.s3_client = s3
+    book_flight._passenger_cache["data"] = None
+    book_flight._passenger_cache["expires_at"] = 0.0
+
+
+def test_passenger_info_cached_between_invocations():
+    """The passenger info is read from S3 once and reused until the TTL expires"""
+    book_flight = load_lambda('book_flight')
+    s3 = FakeS3Client(PASSENGER)
+    reset_passenger_cache(book_flight, s3)
+
+    assert book_flight.load_passenger_info_from_s3() == PASSENGER
+    assert book_flight.load_passenger_info_from_s3() == PASSENGER
+    assert s3.calls == 1
+
+    # Once expired, the next call goes back to S3
+    book_flight._passenger_cache["expires_at"] = 0.0
+    book_flight.load_passenger_info_from_s3()
+    assert s3.calls == 2
+
+
+def test_passenger_info_defaults_not_cached():
+    """An S3 failure returns the default passenger without pinning it in the cache"""
+    book_flight = load_lambda('book_flight')
+    s3 = FakeS3Client(None)
+    reset_passenger_cache(book_flight, s3)
+
+    assert book_flight.load_passenger_info_from_s3()["name"]["firstName"] == "John"
+    assert book_flight._passenger_cache["data"] is None
+
+    s3.passenger = PASSENGER
+    assert book_flight.load_passenger_info_from_s3() == PASSENGER
+    assert s3.calls == 2
+
+
+def test_search_cache_expiry_and_lru_eviction():
+    """Cached searches expire after the TTL and the least recently used entry is evicted"""
+    search = load_lambda('search_flights')
+    search._search_cache.clear()
+    search.SEARCH_CACHE_MAX_ENTRIES = 2
+
+    search._store_cached_search(('a',), {"flights": "a"})
+    search._store_cached_search(('b',), {"flights": "b"})
+    assert search._get_cached_search(('a',)) == {"flights": "a"}
+
+    # 'b' is now the least recently used entry
+    search._store_cached_search(('c',), {"flights": "c"})
+    assert search._get_cached_search(('b',)) is None
+    assert search._get_cached_search(('a',)) == {"flights": "a"}
+    assert search._get_cached_search(('c',)) == {"flights": "c"}
+
+    # Expired entries are dropped on read
+    search.SEARCH_CACHE_TTL_SECONDS = -1
+    search._store_cached_search(('d',), {"flights": "d"})
+    assert search._get_cached_search(('d',)) is None
+    assert ('d',) not in search._search_cache
+
+
+def test_search_flights_served_from_cache():
+    """A repeated search (in any letter case) is answered without calling Amadeus"""
+    search = load_lambda('search_flights')
+    search._search_cache.clear()
+    cached_result = {"success": True, "flight_count": 0, "flights": []}
+    search._store_cached_search(('JFK', 'LAX', '2025-12-15', 1, 5, 'AA'), cached_result)
+
+    def no_amadeus():
+        raise AssertionError("Amadeus should not be called for a cached search")
+
+    search._get_amadeus_token = no_amadeus
+    assert search.search_flights('jfk', 'lax', '2025-12-15', carrier='aa') is cached_result
+
+
+def main():
+    """Run the cache tests"""
+    tests = [
+        test_passenger_info_cached_between_invocations,
+        test_passenger_info_defaults_not_cached,
+        test_search_cache_expiry_and_lru_eviction,
+        test_search_flights_served_from_cache,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e!r}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())